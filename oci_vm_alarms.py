@@ -2,10 +2,37 @@
 
 import oci
 import sys
+import time
+import logging
 import argparse
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional
+
+# OCIHTTPAdapter is the SDK's own transport adapter; urllib3 is a declared
+# SDK dependency.
+from oci.base_client import OCIHTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
 
 class OCIVMAlarmManager:
+    # Number of worker threads for parallel alarm creation. Alarm creation is
+    # network-bound (one OCI REST round-trip per VM), so fanning out gives a
+    # near-linear speedup up to the pool size.
+    MAX_WORKERS = 16
+
+    # How long a successful topic validation stays cached (seconds). Topics
+    # change rarely, so 15 minutes is a safe window to skip repeat get_topic
+    # round-trips in batch/loop usage.
+    TOPIC_VALIDATION_TTL = 900
+
+    # Query pattern for the accessibility alarm, built once at class scope
+    # and formatted per VM instead of rebuilding the f-string on every call
+    _QUERY_TMPL = (
+        'InstanceAccessibilityStatus[5m]{{resourceDisplayName = "{n}"}}.mean() > 0 '
+        '|| InstanceAccessibilityStatus[5m]{{resourceDisplayName = "{n}"}}.absent(10m) == 1'
+    )
+
     def __init__(self, compartment_id: Optional[str] = None, non_interactive: bool = False):
         """
         Initialize the OCI VM Alarm Manager
@@ -23,9 +50,96 @@ class OCIVMAlarmManager:
         self.notification_client = oci.ons.NotificationDataPlaneClient(self.config)
         self.notification_control_client = oci.ons.NotificationControlPlaneClient(self.config)
 
-        self.compartment_id = compartment_id
+        # Tune each client's own keep-alive session. The sessions are NOT
+        # shared across clients: BaseClient closes and re-copies its session
+        # on certain error responses, which would yank a shared session out
+        # from under the other clients mid-run.
+        for client in (self.compute_client, self.monitoring_client,
+                       self.notification_client, self.notification_control_client):
+            self._tune_http_session(client)
+
+        self.compartment_id = compartment_id  # setter also builds _alarm_defaults
         self.non_interactive = non_interactive
 
+        # Topic OCID -> (result, monotonic timestamp) for validation caching
+        self._validated_topics = {}
+
+        # Instance OCID -> fetched instance, so compartment auto-detection and
+        # the later get_vm_by_ocid lookup share one get_instance round-trip.
+        # No TTL: a run completes in seconds and the fields we read
+        # (display_name, lifecycle_state) only need to be accurate at start.
+        self._instance_cache = {}
+
+    @property
+    def compartment_id(self) -> Optional[str]:
+        return self._compartment_id
+
+    @compartment_id.setter
+    def compartment_id(self, value: Optional[str]):
+        self._compartment_id = value
+        # Constant CreateAlarmDetails kwargs, rebuilt only when the
+        # compartment changes rather than once per create_alarm call
+        self._alarm_defaults = {
+            'compartment_id': value,
+            'metric_compartment_id': value,
+            'namespace': "oci_compute_instance_health",  # Correct namespace for InstanceAccessibilityStatus
+            'severity': "CRITICAL",
+            'is_enabled': True,
+            'pending_duration': "PT5M",  # 5 minutes
+            'message_format': "ONS_OPTIMIZED"  # Use proper OCI notification format
+        }
+
+    @staticmethod
+    def _tune_http_session(client):
+        """
+        Re-mount a tuned OCIHTTPAdapter on an OCI client's requests.Session
+
+        Sizes the connection pool to the worker count so parallel
+        create_alarm calls reuse TCP+TLS connections, and retries transient
+        throttling/server errors with backoff. Mounting the SDK's own
+        OCIHTTPAdapter (not a bare HTTPAdapter) preserves its transport
+        behavior — Expect header handling and the urllib3 2.x hostname
+        workaround; only the pool size and retry policy change.
+
+        Args:
+            client: Any OCI SDK client (ComputeClient, MonitoringClient, etc.)
+        """
+        adapter = OCIHTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        client.base_client.session.mount('https://', adapter)
+
+    def get_vm_compartment_from_ocid(self, vm_ocid: str) -> Optional[str]:
+        """
+        Look up the compartment OCID of a VM instance
+
+        Args:
+            vm_ocid: The OCID of the VM instance
+
+        Returns:
+            Compartment OCID, or None if the instance could not be fetched
+        """
+        try:
+            instance = self._get_instance_cached(vm_ocid)
+            return instance.compartment_id
+        except Exception as e:
+            logger.error("Error getting VM compartment: %s", e)
+            return None
+
+    def _get_instance_cached(self, vm_ocid: str):
+        """Fetch an instance by OCID, consulting the per-run cache first"""
+        instance = self._instance_cache.get(vm_ocid)
+        if instance is None:
+            instance = self.compute_client.get_instance(instance_id=vm_ocid).data
+            self._instance_cache[vm_ocid] = instance
+        return instance
+
     def get_notification_topics(self) -> List[Dict]:
         """
         Get all notification topics in the compartment
@@ -34,10 +148,10 @@ class OCIVMAlarmManager:
             List of notification topics with their details
         """
         if not self.compartment_id:
-            print("Error: Compartment ID required to list notification topics")
+            logger.error("Error: Compartment ID required to list notification topics")
             return []
 
-        print(f"Fetching notification topics in compartment: {self.compartment_id}")
+        logger.info("Fetching notification topics in compartment: %s", self.compartment_id)
 
         try:
             topics = self.notification_control_client.list_topics(
@@ -53,34 +167,47 @@ class OCIVMAlarmManager:
                     'lifecycle_state': topic.lifecycle_state
                 }
                 topic_list.append(topic_info)
-                print(f"Found topic: {topic.name} (ID: {topic.topic_id})")
+                logger.debug("Found topic: %s (ID: %s)", topic.name, topic.topic_id)
 
             return topic_list
 
         except Exception as e:
-            print(f"Error fetching notification topics: {str(e)}")
+            logger.error("Error fetching notification topics: %s", e)
             return []
 
-    def validate_notification_topic(self, topic_ocid: str) -> bool:
+    def validate_notification_topic(self, topic_ocid: str, force_refresh: bool = False) -> bool:
         """
         Validate that the notification topic exists and is accessible
 
+        Validation outcomes are cached for 15 minutes per topic OCID, so
+        callers that validate repeatedly (e.g. batch loops) only pay one
+        get_topic round-trip per topic.
+
         Args:
             topic_ocid: The OCID of the notification topic to validate
+            force_refresh: If True, bypass the cache and re-fetch the topic
 
         Returns:
             True if topic is valid and accessible, False otherwise
         """
+        if not force_refresh:
+            cached = self._validated_topics.get(topic_ocid)
+            if cached and time.monotonic() - cached[1] < self.TOPIC_VALIDATION_TTL:
+                return cached[0]
+
         try:
             topic = self.notification_control_client.get_topic(topic_id=topic_ocid)
             if topic.data.lifecycle_state == 'ACTIVE':
-                print(f"✓ Notification topic validated: {topic.data.name}")
-                return True
+                logger.info("✓ Notification topic validated: %s", topic.data.name)
+                result = True
             else:
-                print(f"✗ Notification topic is not active (state: {topic.data.lifecycle_state})")
-                return False
+                logger.info("✗ Notification topic is not active (state: %s)", topic.data.lifecycle_state)
+                result = False
+            self._validated_topics[topic_ocid] = (result, time.monotonic())
+            return result
         except Exception as e:
-            print(f"✗ Error validating notification topic: {str(e)}")
+            # Errors are likely transient, so leave them uncached
+            logger.error("✗ Error validating notification topic: %s", e)
             return False
 
     def get_vm_by_ocid(self, vm_ocid: str) -> Dict:
@@ -93,10 +220,10 @@ class OCIVMAlarmManager:
         Returns:
             VM instance details or None if not found
         """
-        print(f"Fetching VM: {vm_ocid}")
+        logger.info("Fetching VM: %s", vm_ocid)
 
         try:
-            instance = self.compute_client.get_instance(instance_id=vm_ocid).data
+            instance = self._get_instance_cached(vm_ocid)
 
             vm_info = {
                 'id': instance.id,
@@ -104,29 +231,34 @@ class OCIVMAlarmManager:
                 'lifecycle_state': instance.lifecycle_state,
                 'availability_domain': instance.availability_domain
             }
-            print(f"Found VM: {instance.display_name} (State: {instance.lifecycle_state})")
+            logger.info("Found VM: %s (State: %s)", instance.display_name, instance.lifecycle_state)
             return vm_info
 
         except Exception as e:
-            print(f"Error fetching VM {vm_ocid}: {str(e)}")
+            logger.error("Error fetching VM %s: %s", vm_ocid, e)
             return None
 
-    def get_all_vms(self) -> List[Dict]:
+    def get_all_vms(self) -> Iterator[Dict]:
         """
-        Get all VM instances in the specified compartment
+        Stream all VM instances in the specified compartment
 
-        Returns:
-            List of VM instances with their details
+        Uses the OCI pagination helper so results arrive page by page
+        (list_instances alone returns only the first page), and callers can
+        start working on the first page while later pages are still in flight.
+
+        Yields:
+            VM instance details, one dict per running instance
         """
-        print(f"Fetching all VMs in compartment: {self.compartment_id}")
+        logger.info("Fetching all VMs in compartment: %s", self.compartment_id)
 
         try:
-            instances = self.compute_client.list_instances(
-                compartment_id=self.compartment_id,
+            instances = oci.pagination.list_call_get_all_results_generator(
+                self.compute_client.list_instances,
+                'record',
+                self.compartment_id,
                 lifecycle_state="RUNNING"  # Only get running instances
-            ).data
+            )
 
-            vm_list = []
             for instance in instances:
                 vm_info = {
                     'id': instance.id,
@@ -134,14 +266,11 @@ class OCIVMAlarmManager:
                     'lifecycle_state': instance.lifecycle_state,
                     'availability_domain': instance.availability_domain
                 }
-                vm_list.append(vm_info)
-                print(f"Found VM: {instance.display_name} (ID: {instance.id})")
-
-            return vm_list
+                logger.debug("Found VM: %s (ID: %s)", instance.display_name, instance.id)
+                yield vm_info
 
         except Exception as e:
-            print(f"Error fetching VMs: {str(e)}")
-            return []
+            logger.error("Error fetching VMs: %s", e)
 
     def create_alarm_for_vm(self, vm_name: str, notification_topic_ocid: str) -> bool:
         """
@@ -157,33 +286,26 @@ class OCIVMAlarmManager:
         alarm_name = f"{vm_name} - Unresponsive or Stopped Alert"
 
         # Query pattern from the user's example, adapted for the specific VM
-        query = f'InstanceAccessibilityStatus[5m]{{resourceDisplayName = "{vm_name}"}}.mean() > 0 || InstanceAccessibilityStatus[5m]{{resourceDisplayName = "{vm_name}"}}.absent(10m) == 1'
-
-        # Set up destinations for notifications (required)
-        destinations = [notification_topic_ocid]
+        query = self._QUERY_TMPL.format(n=vm_name)
 
         alarm_details = oci.monitoring.models.CreateAlarmDetails(
             display_name=alarm_name,
-            compartment_id=self.compartment_id,
-            metric_compartment_id=self.compartment_id,
-            namespace="oci_compute_instance_health",  # Correct namespace for InstanceAccessibilityStatus
             query=query,
-            severity="CRITICAL",
-            destinations=destinations,
-            is_enabled=True,
+            destinations=[notification_topic_ocid],  # required for notifications
             body=f"VM {vm_name} is unresponsive or in a stopped state. Please check the instance status.",
-            pending_duration="PT5M",  # 5 minutes
-            message_format="ONS_OPTIMIZED"  # Use proper OCI notification format
+            **self._alarm_defaults
         )
 
         try:
-            print(f"Creating alarm for VM: {vm_name}")
+            # Per-VM progress is DEBUG so parallel workers don't serialize on
+            # the stream handler's lock during bulk runs
+            logger.debug("Creating alarm for VM: %s", vm_name)
             response = self.monitoring_client.create_alarm(alarm_details)
-            print(f"✓ Alarm created successfully for {vm_name} (Alarm ID: {response.data.id})")
+            logger.debug("✓ Alarm created successfully for %s (Alarm ID: %s)", vm_name, response.data.id)
             return True
 
         except Exception as e:
-            print(f"✗ Error creating alarm for {vm_name}: {str(e)}")
+            logger.error("✗ Error creating alarm for %s: %s", vm_name, e)
             return False
 
     def create_alarms_for_all_vms_with_topic(self, notification_topic_ocid: str) -> Dict[str, bool]:
@@ -196,21 +318,33 @@ class OCIVMAlarmManager:
         Returns:
             Dictionary with VM names as keys and success status as values
         """
-        print(f"Using notification topic: {notification_topic_ocid}")
+        logger.info("Using notification topic: %s", notification_topic_ocid)
 
-        vms = self.get_all_vms()
+        results = {}
 
-        if not vms:
-            print("No VMs found in the compartment")
-            return {}
+        # Alarm creation is independent per VM (alarm names are unique per VM),
+        # so fan out the create_alarm calls across a thread pool. The OCI SDK
+        # clients are thread-safe for independent requests. VMs are submitted
+        # as they stream out of get_all_vms, so alarm creation for the first
+        # page overlaps with fetching the remaining pages.
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self.create_alarm_for_vm, vm['display_name'], notification_topic_ocid): vm['display_name']
+                for vm in self.get_all_vms()
+            }
 
-        print(f"\nCreating alarms for {len(vms)} VMs...")
-        results = {}
+            if not futures:
+                logger.info("No VMs found in the compartment")
+                return {}
 
-        for vm in vms:
-            vm_name = vm['display_name']
-            success = self.create_alarm_for_vm(vm_name, notification_topic_ocid)
-            results[vm_name] = success
+            logger.info("\nCreating alarms for %d VMs...", len(futures))
+            for future in as_completed(futures):
+                vm_name = futures[future]
+                try:
+                    results[vm_name] = future.result()
+                except Exception as e:
+                    logger.error("✗ Error creating alarm for %s: %s", vm_name, e)
+                    results[vm_name] = False
 
         return results
 
@@ -229,24 +363,24 @@ class OCIVMAlarmManager:
         vm = self.get_vm_by_ocid(vm_ocid)
 
         if not vm:
-            print(f"✗ VM not found or inaccessible: {vm_ocid}")
+            logger.error("✗ VM not found or inaccessible: %s", vm_ocid)
             return False
 
         if vm['lifecycle_state'] != 'RUNNING':
-            print(f"⚠ Warning: VM {vm['display_name']} is not in RUNNING state (current: {vm['lifecycle_state']})")
+            logger.warning("⚠ Warning: VM %s is not in RUNNING state (current: %s)", vm['display_name'], vm['lifecycle_state'])
             if not self.non_interactive:
                 proceed = input("Do you want to create an alarm anyway? (y/n): ").lower().strip()
                 if proceed != 'y':
-                    print("Skipping alarm creation for non-running VM")
+                    logger.info("Skipping alarm creation for non-running VM")
                     return False
 
-        print(f"Creating alarm for VM: {vm['display_name']}")
+        logger.info("Creating alarm for VM: %s", vm['display_name'])
         success = self.create_alarm_for_vm(vm['display_name'], notification_topic_ocid)
 
         if success:
-            print(f"✓ Successfully created alarm for {vm['display_name']}")
+            logger.info("✓ Successfully created alarm for %s", vm['display_name'])
         else:
-            print(f"✗ Failed to create alarm for {vm['display_name']}")
+            logger.error("✗ Failed to create alarm for %s", vm['display_name'])
 
         return success
 
@@ -254,35 +388,53 @@ class OCIVMAlarmManager:
     def print_summary(self, results: Dict[str, bool]):
         """Print a summary of the alarm creation process"""
         total = len(results)
-        successful = sum(1 for success in results.values() if success)
+        successful = sum(results.values())  # bools sum as 0/1
         failed = total - successful
 
-        print(f"\n{'='*50}")
-        print(f"ALARM CREATION SUMMARY")
-        print(f"{'='*50}")
-        print(f"Total VMs processed: {total}")
-        print(f"Alarms created successfully: {successful}")
-        print(f"Failed alarm creations: {failed}")
+        logger.info("\n%s", '=' * 50)
+        logger.info("ALARM CREATION SUMMARY")
+        logger.info("%s", '=' * 50)
+        logger.info("Total VMs processed: %d", total)
+        logger.info("Alarms created successfully: %d", successful)
+        logger.info("Failed alarm creations: %d", failed)
 
         if failed > 0:
-            print(f"\nFailed VMs:")
-            for vm_name, success in results.items():
-                if not success:
-                    print(f"  - {vm_name}")
+            failed_names = [vm_name for vm_name, success in results.items() if not success]
+            logger.info("\nFailed VMs:\n  - %s", '\n  - '.join(failed_names))
+
+def _validate_ocids(vm_ocid: Optional[str], compartment_id: Optional[str], topic_ocid: str):
+    """
+    Fast-fail on malformed OCIDs before any OCI config read or API call
+
+    Checking all user-supplied OCIDs up front means a typo costs microseconds
+    instead of a client construction plus an API round-trip. The compartment
+    may be None in single VM mode; it is auto-detected later (and the detected
+    value comes from OCI itself, so it needs no format check).
+
+    Args:
+        vm_ocid: VM instance OCID, or None outside single VM mode
+        compartment_id: Compartment OCID, or None when auto-detection applies
+        topic_ocid: Notification topic OCID
+    """
+    if vm_ocid and not vm_ocid.startswith('ocid1.instance.'):
+        logger.error("Error: Invalid VM instance OCID format. Must start with 'ocid1.instance.'")
+        sys.exit(1)
+
+    if compartment_id and not compartment_id.startswith('ocid1.compartment.'):
+        logger.error("Error: Invalid compartment OCID format. Must start with 'ocid1.compartment.'")
+        sys.exit(1)
+
+    if not topic_ocid.startswith('ocid1.onstopic.'):
+        logger.error("Error: Invalid notification topic OCID format. Must start with 'ocid1.onstopic.'")
+        sys.exit(1)
 
-def get_vm_compartment_from_ocid(vm_ocid: str) -> str:
-    """Extract compartment OCID from VM instance OCID if needed"""
-    try:
-        config = oci.config.from_file()
-        compute_client = oci.core.ComputeClient(config)
-        instance = compute_client.get_instance(instance_id=vm_ocid).data
-        return instance.compartment_id
-    except Exception as e:
-        print(f"Error getting VM compartment: {str(e)}")
-        return None
 
 def main():
     """Main function to run the alarm creation process"""
+    # Single stream handler; per-VM progress logs at DEBUG and stays quiet
+    # unless the level is lowered
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     parser = argparse.ArgumentParser(
         description='Create OCI VM monitoring alarms',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -316,60 +468,47 @@ Examples:
     # Determine mode and validate requirements
     single_vm_mode = bool(args.vm_ocid)
 
-    if single_vm_mode:
-        # Single VM mode - compartment is optional (will be auto-detected)
-        vm_instance_ocid = args.vm_ocid
-        compartment_id = args.compartment
-
-        if not vm_instance_ocid.startswith('ocid1.instance.'):
-            print("Error: Invalid VM instance OCID format. Must start with 'ocid1.instance.'")
-            sys.exit(1)
-
-        # Auto-detect compartment if not provided
-        if not compartment_id:
-            print("Auto-detecting compartment from VM instance...")
-            compartment_id = get_vm_compartment_from_ocid(vm_instance_ocid)
-            if not compartment_id:
-                print("Error: Could not determine compartment from VM OCID. Please specify --compartment")
-                sys.exit(1)
-            print(f"Detected compartment: {compartment_id}")
-
-    else:
+    if not single_vm_mode and not args.compartment:
         # All VMs mode - compartment is required
-        if not args.compartment:
-            print("Error: --compartment is required when not using --vm-ocid")
-            parser.print_help()
-            sys.exit(1)
-        compartment_id = args.compartment
-        vm_instance_ocid = None
-
-    # Validate OCIDs
-    if not compartment_id.startswith('ocid1.compartment.'):
-        print("Error: Invalid compartment OCID format. Must start with 'ocid1.compartment.'")
+        logger.error("Error: --compartment is required when not using --vm-ocid")
+        parser.print_help()
         sys.exit(1)
 
-    if not args.topic.startswith('ocid1.onstopic.'):
-        print("Error: Invalid notification topic OCID format. Must start with 'ocid1.onstopic.'")
-        sys.exit(1)
+    # Validate all OCID formats before touching the OCI config or any client
+    _validate_ocids(args.vm_ocid, args.compartment, args.topic)
+
+    # In single VM mode the compartment is optional (auto-detected below)
+    vm_instance_ocid = args.vm_ocid
+    compartment_id = args.compartment
 
     try:
         # Initialize the alarm manager
         alarm_manager = OCIVMAlarmManager(compartment_id, args.non_interactive)
 
+        # Auto-detect compartment if not provided (single VM mode only)
+        if single_vm_mode and not compartment_id:
+            logger.info("Auto-detecting compartment from VM instance...")
+            compartment_id = alarm_manager.get_vm_compartment_from_ocid(vm_instance_ocid)
+            if not compartment_id:
+                logger.error("Error: Could not determine compartment from VM OCID. Please specify --compartment")
+                sys.exit(1)
+            logger.info("Detected compartment: %s", compartment_id)
+            alarm_manager.compartment_id = compartment_id
+
         # Validate the notification topic first
         if not alarm_manager.validate_notification_topic(args.topic):
-            print("Error: Unable to validate notification topic. Please check the OCID and try again.")
+            logger.error("Error: Unable to validate notification topic. Please check the OCID and try again.")
             sys.exit(1)
 
         if single_vm_mode:
             # Create alarm for single VM
-            print(f"Creating alarm for single VM: {vm_instance_ocid}")
+            logger.info("Creating alarm for single VM: %s", vm_instance_ocid)
             success = alarm_manager.create_alarm_for_single_vm(vm_instance_ocid, args.topic)
 
             if success:
-                print(f"\n✓ Successfully created alarm for VM")
+                logger.info("\n✓ Successfully created alarm for VM")
             else:
-                print(f"\n✗ Failed to create alarm for VM")
+                logger.error("\n✗ Failed to create alarm for VM")
                 sys.exit(1)
         else:
             # Create alarms for all VMs using the provided topic
@@ -379,10 +518,10 @@ Examples:
             alarm_manager.print_summary(results)
 
     except oci.exceptions.ConfigFileNotFound:
-        print("Error: OCI config file not found. Please run 'oci setup config' first.")
+        logger.error("Error: OCI config file not found. Please run 'oci setup config' first.")
         sys.exit(1)
     except Exception as e:
-        print(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         sys.exit(1)
 
 if __name__ == "__main__":